@@ -3,20 +3,40 @@ Google Cloud adapted main application for Legal RAG Application with Model Conte
 This module provides Cloud-specific integration and serves as the entry point for Cloud Run.
 """
 
+import io
 import os
 import json
+import shutil
+import hashlib
 import logging
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
+
+import diskcache
+import numpy as np
 from flask import Flask, request, jsonify
-from google.cloud import storage, firestore
+from flask_compress import Compress
+from werkzeug.middleware.dispatcher import DispatcherMiddleware
+from google.cloud import storage, firestore, tasks_v2
+from google.cloud.storage import transfer_manager
+from google.cloud.firestore_v1.base_vector_query import DistanceMeasure
+from google.cloud.firestore_v1.vector import Vector
+import google.auth.transport.requests
 import google.oauth2.credentials
+from google.oauth2 import id_token
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 
 # Import application components
+import pdf_worker
 from src.mcp.server import MCPServer
 from src.rag.engine import RAGEngine
 from src.document_processing.processor import DocumentProcessor
-from src.output.pdf_generator import PDFGenerator
 
 # Configure logging
 logging.basicConfig(
@@ -25,6 +45,197 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class QueryCache:
+    """
+    LRU + TTL cache for search results.
+
+    Exact hits are keyed on the normalized query text and top_k; a
+    semantic lookup additionally matches queries whose embeddings have
+    cosine similarity >= the threshold against a cached entry, so
+    paraphrased repeats also skip the encoder and the KNN query.
+    """
+
+    def __init__(self, max_entries=1000, ttl_seconds=300, similarity_threshold=0.95):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(query, top_k):
+        digest = hashlib.blake2b(
+            query.lower().strip().encode(), digest_size=16
+        ).digest()
+        return (digest, top_k)
+
+    def get(self, query, top_k):
+        """Return cached results for an exact query match, or None."""
+        key = self._key(query, top_k)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry['stored_at'] > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry['results']
+
+    def get_semantic(self, query_vector, top_k):
+        """Return cached results for a near-duplicate query, or None."""
+        now = time.monotonic()
+        with self._lock:
+            for (_, entry_top_k), entry in reversed(self._entries.items()):
+                if entry_top_k != top_k:
+                    continue
+                if now - entry['stored_at'] > self.ttl_seconds:
+                    continue
+                # Embeddings are L2-normalized, so the dot product is
+                # the cosine similarity
+                if float(np.dot(query_vector, entry['embedding'])) >= self.similarity_threshold:
+                    return entry['results']
+        return None
+
+    def put(self, query, top_k, query_vector, results):
+        """Store results for a query, evicting the LRU entry if full."""
+        key = self._key(query, top_k)
+        with self._lock:
+            self._entries[key] = {
+                'results': results,
+                'embedding': query_vector,
+                'stored_at': time.monotonic()
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+# Google clients hold gRPC channels whose TLS handshakes should amortize
+# across every request a process serves, so they are process-wide
+# singletons rather than per-app-factory instances
+@lru_cache(maxsize=1)
+def get_db():
+    """Return the process-wide Firestore client."""
+    return firestore.Client()
+
+@lru_cache(maxsize=1)
+def get_storage_client():
+    """Return the process-wide Storage client."""
+    return storage.Client()
+
+@lru_cache(maxsize=1)
+def get_tasks_client():
+    """Return the process-wide Cloud Tasks client."""
+    return tasks_v2.CloudTasksClient()
+
+# Small pool that overlaps the report upload with the response, so
+# clients don't wait on GCS round trips
+_report_io_pool = ThreadPoolExecutor(max_workers=2)
+
+def upload_report(output_file, blob):
+    """Stream a generated report to GCS.
+
+    Exceptions propagate to the submitted future so callers can fail the
+    owning job instead of silently serving a URL that 404s.
+    """
+    # blob.open streams 1MB parts as they are written, so upload
+    # overlaps the file read instead of buffering the whole PDF
+    with open(output_file, 'rb') as src:
+        with blob.open('wb', chunk_size=1024 * 1024) as dst:
+            shutil.copyfileobj(src, dst, length=1024 * 1024)
+
+class HealthCheckMiddleware:
+    """
+    WSGI middleware that answers /health without entering Flask.
+
+    Cloud Run probes this endpoint several times a second per instance;
+    returning a precomputed body here skips routing, dispatch, and JSON
+    serialization entirely.
+    """
+
+    _body = b'{"status":"healthy"}'
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        if environ.get('PATH_INFO') == '/health':
+            start_response('200 OK', [
+                ('Content-Type', 'application/json'),
+                ('Content-Length', str(len(self._body)))
+            ])
+            return [self._body]
+        return self.wsgi_app(environ, start_response)
+
+# Heavy components are created on first use rather than at startup, so a
+# cold-started container that only serves /health never pays the MiniLM
+# model load
+_components_lock = threading.Lock()
+_mcp_server = None
+_doc_processor = None
+_rag_engine = None
+
+def get_mcp_server():
+    """Return the process-wide MCP server, creating it on first use."""
+    global _mcp_server
+    if _mcp_server is None:
+        with _components_lock:
+            if _mcp_server is None:
+                _mcp_server = MCPServer()
+    return _mcp_server
+
+def get_doc_processor():
+    """Return the process-wide document processor, creating it on first use."""
+    global _doc_processor
+    if _doc_processor is None:
+        with _components_lock:
+            if _doc_processor is None:
+                _doc_processor = DocumentProcessor(
+                    ocr_enabled=True,
+                    chunk_size=1000,
+                    chunk_overlap=200
+                )
+    return _doc_processor
+
+def get_rag_engine():
+    """Return the process-wide RAG engine, creating it on first use."""
+    global _rag_engine
+    if _rag_engine is None:
+        with _components_lock:
+            if _rag_engine is None:
+                engine = RAGEngine(
+                    model_name="all-MiniLM-L6-v2",
+                    quantized=True
+                )
+                # One dummy forward pass builds the tokenizer and
+                # compiles the inference kernels here, so the first real
+                # query sees steady-state latency
+                engine.model.encode(["warmup"], convert_to_numpy=True)
+                _rag_engine = engine
+    return _rag_engine
+
+# PDF rendering is CPU-bound pure Python, so it runs in worker processes
+# rather than on the serving threads; the subprocess entry points live in
+# pdf_worker so spawned children import only the PDF generator
+_pdf_pool = None
+
+def get_pdf_pool():
+    """Return the process-wide PDF rendering pool, creating it on first use."""
+    global _pdf_pool
+    if _pdf_pool is None:
+        with _components_lock:
+            if _pdf_pool is None:
+                # Spawn rather than fork: by the time the first report
+                # request arrives this process holds serving threads and
+                # live gRPC channels, neither of which survive a fork
+                _pdf_pool = ProcessPoolExecutor(
+                    max_workers=os.cpu_count(),
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=pdf_worker.init_worker,
+                    initargs=("/tmp/output",)
+                )
+    return _pdf_pool
+
 def create_app():
     """Create and configure the Flask application for Google Cloud."""
     # Load configuration
@@ -35,109 +246,287 @@ def create_app():
     
     # Initialize Flask app
     app = Flask(__name__)
+
+    # Compress text-heavy JSON responses (search results, reports),
+    # preferring Brotli with a Gzip fallback
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_MIN_SIZE'] = 500
+    Compress(app)
+
+    # Bind the process-wide Firestore and Storage clients
+    db = get_db()
+    storage_client = get_storage_client()
     
-    # Initialize Firestore client
-    db = firestore.Client()
-    
-    # Initialize Storage client
-    storage_client = storage.Client()
-    
-    # Initialize MCP server
-    mcp_server = MCPServer()
-    
-    # Initialize document processor
-    doc_processor = DocumentProcessor(
-        ocr_enabled=True,
-        chunk_size=1000,
-        chunk_overlap=200
-    )
-    
-    # Initialize RAG engine
-    rag_engine = RAGEngine(
-        model_name="all-MiniLM-L6-v2"
-    )
-    
-    # Initialize PDF generator
-    pdf_generator = PDFGenerator(output_dir="/tmp/output")
-    
-    # Register MCP routes with Flask app
-    for rule in mcp_server.app.url_map.iter_rules():
-        endpoint = rule.endpoint
-        view_func = mcp_server.app.view_functions[endpoint]
-        app.add_url_rule(rule.rule, endpoint, view_func, methods=rule.methods)
+    # Initialize search result cache
+    query_cache = QueryCache()
+
+    # Initialize content-addressed embedding cache, so re-ingested or
+    # duplicate chunks skip the encoder entirely
+    embedding_cache = diskcache.Cache('/tmp/emb_cache')
+
+    # Cloud Tasks queue that runs the heavy pipelines in the background;
+    # when no queue is configured (local development), the endpoints
+    # fall back to running the pipeline inline
+    tasks_config = config.get('tasks', {})
+
+    def create_job(job_type, payload):
+        """Record a background job in Firestore and return its reference."""
+        job_ref = db.collection('jobs').document()
+        job_ref.set({
+            'type': job_type,
+            'status': 'pending',
+            'request': payload,
+            'created_at': firestore.SERVER_TIMESTAMP
+        })
+        return job_ref
+
+    def enqueue_task(path, payload):
+        """Enqueue a Cloud Task that POSTs the payload to a worker endpoint."""
+        parent = get_tasks_client().queue_path(
+            tasks_config['project_id'],
+            tasks_config['location'],
+            tasks_config['queue']
+        )
+        task = {
+            'http_request': {
+                'http_method': tasks_v2.HttpMethod.POST,
+                'url': tasks_config['service_url'] + path,
+                'headers': {'Content-Type': 'application/json'},
+                'body': json.dumps(payload).encode()
+            }
+        }
+        # Attach an OIDC token so the worker endpoints can require an
+        # authenticated caller on a public Cloud Run service
+        if tasks_config.get('service_account_email'):
+            task['http_request']['oidc_token'] = {
+                'service_account_email': tasks_config['service_account_email'],
+                'audience': tasks_config['service_url']
+            }
+        get_tasks_client().create_task(parent=parent, task=task)
+
+    # Reusable transport for verifying task OIDC tokens
+    token_request = google.auth.transport.requests.Request()
+
+    def from_task_queue():
+        """Verify the OIDC token Cloud Tasks attaches to its callbacks.
+
+        Cloud Run forwards X-CloudTasks-* headers from direct requests
+        unchanged, so any external caller can fake them; only the signed
+        bearer token proves the request came through our queue.
+        """
+        auth_header = request.headers.get('Authorization', '')
+        if not auth_header.startswith('Bearer '):
+            return False
+        try:
+            claims = id_token.verify_oauth2_token(
+                auth_header[len('Bearer '):],
+                token_request,
+                audience=tasks_config.get('service_url')
+            )
+        except ValueError:
+            return False
+        return (
+            claims.get('email') == tasks_config.get('service_account_email')
+            and claims.get('email_verified', False)
+        )
     
-    # Add health check endpoint
-    @app.route('/health')
-    def health_check():
-        return {'status': 'healthy'}
+    # Mount the MCP app as a WSGI sub-app under /mcp; dispatching is a
+    # prefix match instead of copying every rule into our URL map at
+    # startup, and the MCP server itself is only built when the first
+    # /mcp request arrives
+    def mcp_wsgi_app(environ, start_response):
+        return get_mcp_server().app(environ, start_response)
+
+    app.wsgi_app = DispatcherMiddleware(app.wsgi_app, {
+        '/mcp': mcp_wsgi_app
+    })
+
+    # Answer health probes at the WSGI layer, before Flask dispatch
+    app.wsgi_app = HealthCheckMiddleware(app.wsgi_app)
+
+    # Add warmup endpoint for a Cloud Run startup probe, so an instance
+    # can pre-load heavy components before taking real traffic
+    @app.route('/warmup')
+    def warmup():
+        get_mcp_server()
+        get_doc_processor()
+        get_rag_engine()
+        # Submitting a no-op makes the spawn cost of the first rendering
+        # worker land in the startup probe, not the first report request
+        get_pdf_pool().submit(pdf_worker.warmup).result()
+        # Touch the Firestore gRPC transport so channel creation and the
+        # TLS handshake happen before the first real request
+        get_db()._firestore_api
+        return {'status': 'warm'}
     
-    # Add document processing endpoint
-    @app.route('/api/process-document', methods=['POST'])
-    def process_document():
-        """Process a document uploaded to Cloud Storage."""
-        data = request.json
-        
-        if not data or 'bucket' not in data or 'file' not in data:
-            return jsonify({'error': 'Missing bucket or file parameter'}), 400
-        
+    def ingest_document(file_obj, file_name, bucket_name, document_type):
+        """Process a downloaded file and store its chunks in Firestore."""
+        # Process document
+        doc_result = get_doc_processor().process_stream(file_obj, file_name)
+
+        # Override document type if provided
+        if document_type:
+            doc_result["document_type"] = document_type
+
+        # Store document metadata and chunks in Firestore using batched
+        # writes, so N chunks cost ceil(N/500) round trips instead of N
+        doc_ref = db.collection('documents').document()
+        batch = db.batch()
+        batch.set(doc_ref, {
+            'file_name': file_name,
+            'bucket': bucket_name,
+            'document_type': doc_result["document_type"],
+            'metadata': doc_result["metadata"],
+            'processed_at': firestore.SERVER_TIMESTAMP
+        })
+        writes_in_batch = 1
+
+        # Embed chunks and store them alongside their vectors, so
+        # Firestore serves KNN search directly with no FAISS sidecar
+        if doc_result["chunks"]:
+            document_id = doc_ref.id
+
+            # Look up embeddings by content hash and encode only the
+            # misses, in one batch
+            contents = [chunk["content"] for chunk in doc_result["chunks"]]
+            hashes = [
+                hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+                for content in contents
+            ]
+            vectors = [embedding_cache.get(h) for h in hashes]
+            misses = [i for i, vector in enumerate(vectors) if vector is None]
+            if misses:
+                miss_vectors = get_rag_engine().embed([contents[i] for i in misses])
+                for i, vector in zip(misses, miss_vectors):
+                    vectors[i] = vector
+                    embedding_cache.set(hashes[i], vector)
+
+            # Queue chunks into the same batch, flushing at the
+            # Firestore limit of 500 writes per commit
+            for chunk, vector in zip(doc_result["chunks"], vectors):
+                chunk_ref = db.collection('document_chunks').document()
+                batch.set(chunk_ref, {
+                    'document_id': document_id,
+                    'chunk_index': chunk["index"],
+                    'content': chunk["content"],
+                    'embedding': Vector(vector.tolist()),
+                    'metadata': {
+                        'start_char': chunk.get("start_char"),
+                        'end_char': chunk.get("end_char")
+                    }
+                })
+                writes_in_batch += 1
+                if writes_in_batch >= 500:
+                    batch.commit()
+                    batch = db.batch()
+                    writes_in_batch = 0
+
+        if writes_in_batch > 0:
+            batch.commit()
+
+        return {
+            'document_id': doc_ref.id,
+            'document_type': doc_result["document_type"],
+            'chunks_count': len(doc_result["chunks"])
+        }
+
+    def run_process_document(job_ref, data):
+        """Run the document pipeline and record the outcome on the job."""
         bucket_name = data['bucket']
-        file_name = data['file']
+        file_names = data.get('files') or [data['file']]
         document_type = data.get('document_type')
-        
+
         try:
-            # Download file from Cloud Storage
+            # Download all requested blobs in parallel, straight into
+            # memory; small-file GCS traffic is latency-bound, so
+            # concurrency hides the round trips and skipping /tmp avoids
+            # an extra copy through tmpfs
             bucket = storage_client.bucket(bucket_name)
-            blob = bucket.blob(file_name)
-            temp_file_path = f"/tmp/{os.path.basename(file_name)}"
-            blob.download_to_filename(temp_file_path)
-            
-            # Process document
-            doc_result = doc_processor.process_document(temp_file_path)
-            
-            # Override document type if provided
-            if document_type:
-                doc_result["document_type"] = document_type
-            
-            # Store document metadata in Firestore
-            doc_ref = db.collection('documents').document()
-            doc_ref.set({
-                'file_name': file_name,
-                'bucket': bucket_name,
-                'document_type': doc_result["document_type"],
-                'metadata': doc_result["metadata"],
-                'processed_at': firestore.SERVER_TIMESTAMP
-            })
-            
-            # Add to RAG engine
-            if doc_result["chunks"]:
-                document_id = doc_ref.id
-                rag_engine.add_document(document_id, doc_result["chunks"])
-                
-                # Store chunks in Firestore
-                for chunk in doc_result["chunks"]:
-                    db.collection('document_chunks').add({
-                        'document_id': document_id,
-                        'chunk_index': chunk["index"],
-                        'content': chunk["content"],
-                        'metadata': {
-                            'start_char': chunk.get("start_char"),
-                            'end_char': chunk.get("end_char")
-                        }
-                    })
-            
-            # Clean up temporary file
-            os.remove(temp_file_path)
-            
-            return jsonify({
-                'document_id': doc_ref.id,
-                'document_type': doc_result["document_type"],
-                'chunks_count': len(doc_result["chunks"])
-            })
-            
+            blob_file_pairs = [
+                (bucket.blob(file_name), io.BytesIO())
+                for file_name in file_names
+            ]
+            # raise_exception surfaces per-blob failures (missing object,
+            # bad permissions) instead of leaving an empty buffer behind;
+            # THREAD workers are required for file-object destinations
+            # and are the right choice for latency-bound transfers anyway
+            transfer_manager.download_many(
+                blob_file_pairs,
+                max_workers=16,
+                raise_exception=True,
+                worker_type=transfer_manager.THREAD
+            )
+
+            results = []
+            for (_, buffer), file_name in zip(blob_file_pairs, file_names):
+                buffer.seek(0)
+                results.append(
+                    ingest_document(buffer, file_name, bucket_name, document_type)
+                )
+
+            result = {'results': results} if 'files' in data else results[0]
+            job_ref.set({
+                'status': 'done',
+                'result': result,
+                'finished_at': firestore.SERVER_TIMESTAMP
+            }, merge=True)
+            return jsonify(result)
+
         except Exception as e:
             logger.error(f"Error processing document: {str(e)}")
+            job_ref.set({
+                'status': 'error',
+                'error': str(e),
+                'finished_at': firestore.SERVER_TIMESTAMP
+            }, merge=True)
             return jsonify({'error': str(e)}), 500
-    
+
+    # Add document processing endpoint; enqueues a background job and
+    # returns immediately, so the client doesn't block on the pipeline
+    @app.route('/api/process-document', methods=['POST'])
+    def process_document():
+        """Queue one or more Cloud Storage documents for processing."""
+        data = request.json
+
+        if not data or 'bucket' not in data or not (data.get('file') or data.get('files')):
+            return jsonify({'error': 'Missing bucket or file parameter'}), 400
+
+        job_ref = create_job('process-document', data)
+        if tasks_config.get('queue'):
+            enqueue_task('/worker/process-document', dict(data, job_id=job_ref.id))
+            return jsonify({'job_id': job_ref.id}), 202
+
+        # No queue configured: run inline and answer synchronously
+        return run_process_document(job_ref, data)
+
+    # Add Cloud Tasks worker endpoint for document processing
+    @app.route('/worker/process-document', methods=['POST'])
+    def worker_process_document():
+        """Run the document pipeline for an enqueued job."""
+        if not from_task_queue():
+            return jsonify({'error': 'Forbidden'}), 403
+
+        data = dict(request.json or {})
+        job_id = data.pop('job_id', None)
+        if not job_id:
+            return jsonify({'error': 'Missing job_id'}), 400
+
+        job_ref = db.collection('jobs').document(job_id)
+        job_ref.set({'status': 'running'}, merge=True)
+        return run_process_document(job_ref, data)
+
+    # Add job status endpoint for polling background work
+    @app.route('/api/jobs/<job_id>')
+    def get_job(job_id):
+        """Return the status of a background job."""
+        snapshot = db.collection('jobs').document(job_id).get()
+        if not snapshot.exists:
+            return jsonify({'error': 'Job not found'}), 404
+
+        job = snapshot.to_dict()
+        job['job_id'] = job_id
+        return jsonify(job)
+
     # Add search endpoint
     @app.route('/api/search', methods=['POST'])
     def search():
@@ -151,41 +540,139 @@ def create_app():
         top_k = data.get('top_k', 5)
         
         try:
-            results = rag_engine.search(query, top_k=top_k)
+            # Exact repeats skip both the encoder and the KNN query
+            results = query_cache.get(query, top_k)
+            if results is not None:
+                return jsonify({'results': results})
+
+            # Embed the query once and let Firestore's native KNN index
+            # do the nearest-neighbour lookup
+            query_vector = get_rag_engine().embed([query])[0]
+
+            # Near-duplicate queries still skip the KNN round trip
+            results = query_cache.get_semantic(query_vector, top_k)
+            if results is not None:
+                return jsonify({'results': results})
+
+            docs = db.collection('document_chunks').find_nearest(
+                vector_field='embedding',
+                query_vector=Vector(query_vector.tolist()),
+                distance_measure=DistanceMeasure.COSINE,
+                limit=top_k
+            ).get()
+
+            results = []
+            for doc in docs:
+                chunk = doc.to_dict()
+                chunk.pop('embedding', None)
+                results.append(chunk)
+
+            query_cache.put(query, top_k, query_vector, results)
             return jsonify({'results': results})
         except Exception as e:
             logger.error(f"Error searching documents: {str(e)}")
             return jsonify({'error': str(e)}), 500
     
-    # Add PDF generation endpoint
-    @app.route('/api/generate-case-report', methods=['POST'])
-    def generate_case_report():
-        """Generate a case report PDF."""
-        data = request.json
-        
-        if not data:
-            return jsonify({'error': 'Missing case data'}), 400
-        
+    def run_generate_case_report(job_ref, data, wait_for_upload=False):
+        """Render and upload a case report, recording the outcome on the job."""
         try:
-            output_file = pdf_generator.generate_case_report(data)
-            
-            # Upload PDF to Cloud Storage
+            # Render in a worker process so the GIL stays free for
+            # encoding and search traffic
+            output_file = get_pdf_pool().submit(pdf_worker.render_case_report, data).result()
+
+            # Hand the upload to the background pool; signing the URL is
+            # local to the process, so the response doesn't need to wait
+            # for the GCS round trip
             bucket_name = config.get('storage', {}).get('documents_bucket', 'legal-rag-documents')
             bucket = storage_client.bucket(bucket_name)
             blob = bucket.blob(f"reports/{os.path.basename(output_file)}")
-            blob.upload_from_filename(output_file)
-            
-            # Make the blob publicly accessible
-            blob.make_public()
-            
-            return jsonify({
-                'pdf_url': blob.public_url,
+            upload_future = _report_io_pool.submit(upload_report, output_file, blob)
+
+            # A v4 signed URL avoids the ACL-mutation RPC make_public
+            # would cost and keeps the object private
+            pdf_url = blob.generate_signed_url(
+                version='v4',
+                expiration=timedelta(hours=24),
+                method='GET'
+            )
+
+            result = {
+                'pdf_url': pdf_url,
                 'file_name': os.path.basename(output_file)
-            })
+            }
+
+            # The terminal job status is written only here, once the
+            # upload has actually finished; writing 'done' from the
+            # request thread would race a fast-failing upload and could
+            # overwrite its 'error' with a URL that 404s forever
+            def on_upload_done(future):
+                exc = future.exception()
+                if exc is not None:
+                    logger.error(f"Error uploading case report {output_file}: {str(exc)}")
+                    job_ref.set({
+                        'status': 'error',
+                        'error': str(exc),
+                        'finished_at': firestore.SERVER_TIMESTAMP
+                    }, merge=True)
+                else:
+                    job_ref.set({
+                        'status': 'done',
+                        'result': result,
+                        'finished_at': firestore.SERVER_TIMESTAMP
+                    }, merge=True)
+
+            upload_future.add_done_callback(on_upload_done)
+
+            # The Cloud Tasks worker has no client waiting on its
+            # response, so there is nothing to gain from returning
+            # before the bytes are durable
+            if wait_for_upload:
+                upload_future.result()
+
+            return jsonify(result)
         except Exception as e:
             logger.error(f"Error generating case report: {str(e)}")
+            job_ref.set({
+                'status': 'error',
+                'error': str(e),
+                'finished_at': firestore.SERVER_TIMESTAMP
+            }, merge=True)
             return jsonify({'error': str(e)}), 500
-    
+
+    # Add PDF generation endpoint; same enqueue-and-poll pattern as
+    # document processing
+    @app.route('/api/generate-case-report', methods=['POST'])
+    def generate_case_report():
+        """Queue generation of a case report PDF."""
+        data = request.json
+
+        if not data:
+            return jsonify({'error': 'Missing case data'}), 400
+
+        job_ref = create_job('generate-case-report', data)
+        if tasks_config.get('queue'):
+            enqueue_task('/worker/generate-case-report', dict(data, job_id=job_ref.id))
+            return jsonify({'job_id': job_ref.id}), 202
+
+        # No queue configured: run inline and answer synchronously
+        return run_generate_case_report(job_ref, data)
+
+    # Add Cloud Tasks worker endpoint for PDF generation
+    @app.route('/worker/generate-case-report', methods=['POST'])
+    def worker_generate_case_report():
+        """Render a case report for an enqueued job."""
+        if not from_task_queue():
+            return jsonify({'error': 'Forbidden'}), 403
+
+        data = dict(request.json or {})
+        job_id = data.pop('job_id', None)
+        if not job_id:
+            return jsonify({'error': 'Missing job_id'}), 400
+
+        job_ref = db.collection('jobs').document(job_id)
+        job_ref.set({'status': 'running'}, merge=True)
+        return run_generate_case_report(job_ref, data, wait_for_upload=True)
+
     # Add Google Drive setup endpoint
     @app.route('/api/setup-drive', methods=['POST'])
     def setup_drive():
@@ -197,14 +684,11 @@ def create_app():
             return jsonify({'error': 'Missing credentials'}), 400
         
         try:
-            # Save credentials temporarily
-            temp_creds_path = '/tmp/credentials.json'
-            with open(temp_creds_path, 'w') as f:
-                json.dump(credentials_json, f)
-            
-            # Initialize Google Drive client
+            # Initialize the Google Drive client straight from the
+            # in-memory service-account info; the credentials never
+            # touch disk and there is no JSON round trip through /tmp
             from src.google_drive.client import GoogleDriveClient
-            drive_client = GoogleDriveClient(credentials_path=temp_creds_path)
+            drive_client = GoogleDriveClient(credentials_info=credentials_json)
             
             # Create custom folder structure based on user preferences
             folder_ids = {}
@@ -221,13 +705,12 @@ def create_app():
                 "that which is sent out"
             ]
             
-            for folder_name in custom_folders:
-                folder_id = drive_client.create_folder(folder_name, parent_id=root_id)
-                folder_ids[folder_name] = folder_id
-            
-            # Clean up temporary credentials
-            os.remove(temp_creds_path)
-            
+            # Create the subfolders in one batched Drive request instead
+            # of one HTTP round trip per folder
+            folder_ids.update(
+                drive_client.batch_create_folders(custom_folders, parent_id=root_id)
+            )
+
             return jsonify({'folder_ids': folder_ids})
         except Exception as e:
             logger.error(f"Error setting up Google Drive: {str(e)}")
@@ -235,7 +718,10 @@ def create_app():
     
     return app
 
+# Module-scope app so Gunicorn can serve cloud_main:app directly
+app = create_app()
+
 if __name__ == '__main__':
-    app = create_app()
+    # Werkzeug dev server, local development only
     port = int(os.environ.get('PORT', 8080))
     app.run(host='0.0.0.0', port=port)
@@ -0,0 +1,14 @@
+"""Gunicorn configuration for the Cloud Run container."""
+
+import os
+
+bind = f":{os.environ.get('PORT', '8080')}"
+worker_class = "gthread"
+workers = 2
+threads = 8
+timeout = 0
+
+# Import the application in the master before forking, so module-level
+# state (Firestore/Storage clients, caches) is set up once and shared
+# setup cost amortizes across workers
+preload_app = True
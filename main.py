@@ -79,8 +79,12 @@ class LegalRAGApplication:
             },
             "rag": {
                 "model_name": "all-MiniLM-L6-v2",
+                "quantized": True,
                 "index_path": "data/faiss_index",
-                "chunk_data_path": "data/chunks.json"
+                "chunk_data_path": "data/chunks.parquet",
+                "nlist": 4096,
+                "nprobe": 16,
+                "save_every": 10
             },
             "output": {
                 "output_dir": "output"
@@ -138,9 +142,17 @@ class LegalRAGApplication:
         rag_config = self.config["rag"]
         self.rag_engine = RAGEngine(
             model_name=rag_config["model_name"],
+            quantized=rag_config["quantized"],
             index_path=rag_config["index_path"] if os.path.exists(rag_config["index_path"]) else None,
-            chunk_data_path=rag_config["chunk_data_path"] if os.path.exists(rag_config["chunk_data_path"]) else None
+            chunk_data_path=rag_config["chunk_data_path"] if os.path.exists(rag_config["chunk_data_path"]) else None,
+            nlist=rag_config["nlist"],
+            nprobe=rag_config["nprobe"]
         )
+        self._docs_since_save = 0
+        # One dummy forward pass builds the tokenizer and compiles the
+        # inference kernels here, so the first real query sees
+        # steady-state latency
+        self.rag_engine.model.encode(["warmup"], convert_to_numpy=True)
         logger.info("RAG engine initialized")
         
         # Initialize PDF generator
@@ -187,12 +199,20 @@ class LegalRAGApplication:
         # Add to RAG engine
         if doc_result["chunks"]:
             document_id = os.path.basename(file_path)
-            self.rag_engine.add_document(document_id, doc_result["chunks"])
+            # Encode all chunks in one padded batch rather than one
+            # forward pass per chunk
+            self.rag_engine.add_documents_batch(document_id, doc_result["chunks"])
             logger.info(f"Added document to RAG engine: {document_id} ({len(doc_result['chunks'])} chunks)")
         
-        # Save RAG index and data
+        # Persist the RAG index periodically rather than after every
+        # document; chunk rows append as cheap Parquet row groups but
+        # index serialization is O(N), so it only runs every
+        # save_every documents and on close()
+        self._docs_since_save += 1
         rag_config = self.config["rag"]
-        self.rag_engine.save(rag_config["index_path"], rag_config["chunk_data_path"])
+        if self._docs_since_save >= rag_config["save_every"]:
+            self.rag_engine.save(rag_config["index_path"], rag_config["chunk_data_path"])
+            self._docs_since_save = 0
         
         return {
             "file_path": file_path,
@@ -271,10 +291,12 @@ class LegalRAGApplication:
             "that which is sent out"
         ]
         
-        for folder_name in custom_folders:
-            folder_id = self.drive_client.create_folder(folder_name, parent_id=root_id)
-            folder_ids[folder_name] = folder_id
-        
+        # Create the subfolders in one batched Drive request instead of
+        # one HTTP round trip per folder
+        folder_ids.update(
+            self.drive_client.batch_create_folders(custom_folders, parent_id=root_id)
+        )
+
         logger.info(f"Created {len(folder_ids)} folders in Google Drive")
         return folder_ids
     
@@ -287,6 +309,10 @@ class LegalRAGApplication:
     
     def close(self):
         """Close all resources."""
+        if getattr(self, '_docs_since_save', 0):
+            rag_config = self.config["rag"]
+            self.rag_engine.save(rag_config["index_path"], rag_config["chunk_data_path"])
+            self._docs_since_save = 0
         if hasattr(self, 'db_session'):
             self.db_session.close()
         logger.info("Legal RAG Application resources closed")
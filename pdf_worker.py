@@ -0,0 +1,25 @@
+"""
+Subprocess entry points for the PDF rendering pool.
+
+These live in their own module so that spawned pool workers import only
+the PDF generator: importing cloud_main would execute its module-scope
+app construction, pulling in Flask, the Google clients, and the model
+stack in every worker for no rendering benefit.
+"""
+
+from src.output.pdf_generator import PDFGenerator
+
+_pdf_generator = None
+
+def init_worker(output_dir):
+    """Build one PDFGenerator per rendering worker process."""
+    global _pdf_generator
+    _pdf_generator = PDFGenerator(output_dir=output_dir)
+
+def render_case_report(data):
+    """Render a case report inside a rendering worker process."""
+    return _pdf_generator.generate_case_report(data)
+
+def warmup():
+    """No-op task that forces a worker to spawn during startup probes."""
+    return None